@@ -62,10 +62,92 @@ Last Updated: 2023-11-28
 """
 
 import os
+import sys
+import functools
+import stat
+import ctypes
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext
 from pathlib import Path
 from datetime import datetime
+from collections import namedtuple
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, Future
+
+# A scanned file or directory; size and counts are aggregated bottom-up.
+# `children` is None for directories that could not be read.
+Node = namedtuple('Node', ['name', 'path', 'is_dir', 'size', 'nfiles', 'ndirs', 'children'])
+
+# Units used by format_size(), each 1024 times the previous one
+_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# statx(2) flags used to ask Linux for the size field only, without syncing
+AT_SYMLINK_NOFOLLOW = 0x100
+AT_STATX_DONT_SYNC = 0x4000
+STATX_SIZE = 0x200
+
+class _Statx(ctypes.Structure):
+    # Leading fields of struct statx up to stx_size, padded to its 256 bytes
+    _fields_ = [
+        ('stx_mask', ctypes.c_uint32),
+        ('stx_blksize', ctypes.c_uint32),
+        ('stx_attributes', ctypes.c_uint64),
+        ('stx_nlink', ctypes.c_uint32),
+        ('stx_uid', ctypes.c_uint32),
+        ('stx_gid', ctypes.c_uint32),
+        ('stx_mode', ctypes.c_uint16),
+        ('stx_spare0', ctypes.c_uint16),
+        ('stx_ino', ctypes.c_uint64),
+        ('stx_size', ctypes.c_uint64),
+        ('stx_spare', ctypes.c_uint8 * 208),
+    ]
+
+def _load_statx():
+    """Return libc's statx() if this system supports it, otherwise None."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        func = ctypes.CDLL(None, use_errno=True).statx
+    except (OSError, AttributeError):
+        return None
+    func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_uint, ctypes.POINTER(_Statx)]
+    func.restype = ctypes.c_int
+    # glibc may export statx on kernels that lack the syscall (ENOSYS)
+    if func(-100, b'.', AT_STATX_DONT_SYNC, STATX_SIZE, ctypes.byref(_Statx())) != 0:
+        return None
+    return func
+
+# Probed once at import time
+_statx = _load_statx()
+
+@contextmanager
+def _open_dir(path):
+    """
+    Yield (dir_fd, entries) for a directory.
+    
+    When statx is available the directory is scanned through an open file
+    descriptor so that _fast_size() can stat entries by name relative to it;
+    otherwise dir_fd is None and entries come from a plain os.scandir(path).
+    """
+    dir_fd = None
+    if _statx is not None:
+        dir_fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY | os.O_CLOEXEC)
+    try:
+        with os.scandir(path if dir_fd is None else dir_fd) as it:
+            yield dir_fd, list(it)
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+def _fast_size(dir_fd, entry, buf):
+    """Return the size of a scandir entry, via statx when dir_fd is set."""
+    if dir_fd is not None:
+        flags = AT_SYMLINK_NOFOLLOW | AT_STATX_DONT_SYNC
+        if (_statx(dir_fd, os.fsencode(entry.name), flags, STATX_SIZE, ctypes.byref(buf)) == 0
+                and buf.stx_mask & STATX_SIZE):
+            return buf.stx_size
+    return entry.stat(follow_symlinks=False).st_size
 
 class DirectoryAnalyzerGUI:
     def __init__(self, master):
@@ -135,6 +217,17 @@ class DirectoryAnalyzerGUI:
         
         for label in self.summary_labels.values():
             label.pack(anchor=tk.W)
+        
+        # Set to stop the scan started by the previous Analyze click
+        self._cancel_scan = threading.Event()
+        
+        # Stop a running scan when the window is closed, so its pool drains
+        master.protocol("WM_DELETE_WINDOW", self.close)
+    
+    def close(self):
+        """Cancel any running scan and close the window."""
+        self._cancel_scan.set()
+        self.master.destroy()
     
     def browse_directory(self):
         directory = filedialog.askdirectory()
@@ -150,9 +243,47 @@ class DirectoryAnalyzerGUI:
         for label in self.summary_labels.values():
             label.config(text=label.cget('text').split(':')[0] + ": -")
         
+        # Abandon any scan still running for a previous click
+        self._cancel_scan.set()
+        self._cancel_scan = threading.Event()
+        
+        # Scan on a worker thread so the GUI stays responsive
+        threading.Thread(
+            target=self._do_scan,
+            args=(path, self._cancel_scan),
+            daemon=True
+        ).start()
+    
+    def _do_scan(self, path, cancel):
+        """Scan path on a worker thread and hand the result to the Tk main loop."""
+        try:
+            # Same check and message as print_tree(), before any scanning
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Path does not exist: {os.path.normpath(path)}")
+            node = self._scan(path, cancel)
+            error = None
+        except Exception as e:
+            node, error = None, str(e)
+        
+        # Don't hand results to a main loop that was closed or moved on
+        if cancel.is_set():
+            return
+        try:
+            self.master.after(0, self._render, path, node, cancel, error)
+        except (RuntimeError, tk.TclError):
+            pass  # Window destroyed while the scan was finishing
+    
+    def _render(self, path, node, cancel, error=None):
+        """Display a finished scan; runs on the Tk main loop."""
+        if cancel.is_set():
+            return
+        if error is not None:
+            self.show_error(error)
+            return
+        
         try:
-            self.print_tree(path)
-            self.update_summary(path)
+            self.print_tree(path, node=node)
+            self.update_summary(path, node)
         except Exception as e:
             self.show_error(str(e))
     
@@ -166,11 +297,16 @@ class DirectoryAnalyzerGUI:
         current_depth=0,
         exclude_dirs=None,
         exclude_extensions=None,
-        show_hidden=False
+        show_hidden=False,
+        node=None
     ):
         """
         Print a visual tree structure of a directory with enhanced features.
         
+        The directory is scanned once with _scan() and the tree is rendered
+        from the resulting in-memory nodes, so no further I/O happens while
+        printing.
+        
         Args:
             startpath: Path to the directory or file to display
             prefix: Prefix for the current line (used internally for recursion)
@@ -179,111 +315,311 @@ class DirectoryAnalyzerGUI:
             max_depth: Maximum depth to recurse into (None for unlimited)
             current_depth: Current recursion depth (used internally)
             exclude_dirs: List of directory names to exclude
-            exclude_extensions: List of file extensions to exclude
+            exclude_extensions: List of file extensions to exclude (e.g. ".log")
             show_hidden: Whether to show hidden files/directories
+            node: Already scanned root Node to render instead of scanning startpath
+        
+        Returns:
+            The scanned root Node, or None if the root itself is hidden
         """
         if exclude_dirs is None:
             exclude_dirs = []
         if exclude_extensions is None:
             exclude_extensions = []
         
-        path = Path(startpath)
+        # Lowercased extensions without the leading dot, for O(1) lookups
+        excluded_exts = frozenset(ext.lower().lstrip('.') for ext in exclude_extensions)
+        
+        path = os.path.normpath(startpath)
+        name = os.path.basename(path)
         
         # Validate path
-        if not path.exists():
+        if not os.path.exists(path):
             raise FileNotFoundError(f"Path does not exist: {path}")
         
-        # Skip hidden files if not showing them
-        if not show_hidden and path.name.startswith('.'):
-            return
+        # Skip hidden files if not showing them ('.' itself is not hidden)
+        if not show_hidden and name.startswith('.') and name != os.curdir:
+            return None
         
-        # Get display elements
-        name = path.name if not is_root else str(path)
-        size = self.format_size(self.get_folder_size(path) if path.is_dir() else path.stat().st_size)
-        color_tag = 'folder' if path.is_dir() else 'file'
+        if node is None:
+            node = self._scan(startpath)
+        lines = []
+        self._render_node(
+            node,
+            path if is_root else name,
+            prefix,
+            is_last,
+            max_depth,
+            current_depth,
+            exclude_dirs,
+            excluded_exts,
+            show_hidden,
+            lines
+        )
+        self._insert_lines(lines)
+        return node
+    
+    def _render_node(
+        self,
+        node,
+        name,
+        prefix,
+        is_last,
+        max_depth,
+        current_depth,
+        exclude_dirs,
+        excluded_exts,
+        show_hidden,
+        lines
+    ):
+        """Append (text, tags) lines for a scanned Node and its visible children."""
+        color_tag = 'folder' if node.is_dir else 'file'
         
         # Current item line
         connector = '└── ' if is_last else '├── '
-        line = f"{prefix}{connector}{name} [{size}]\n"
+        line = f"{prefix}{connector}{name} [{self.format_size(node.size)}]\n"
         
-        self.tree_text.insert(tk.END, line, (color_tag, 'size'))
+        lines.append((line, (color_tag, 'size')))
         
         # Stop if it's a file or we've reached max depth
-        if not path.is_dir() or (max_depth is not None and current_depth >= max_depth):
+        if not node.is_dir or (max_depth is not None and current_depth >= max_depth):
             return
         
         # Skip excluded directories
-        if path.name in exclude_dirs:
-            self.tree_text.insert(tk.END, f"{prefix}    └── [Excluded]\n", 'comment')
+        if node.name in exclude_dirs:
+            lines.append((f"{prefix}    └── [Excluded]\n", ('comment',)))
             return
         
         # Prepare for directory contents
         extension = '    ' if is_last else '│   '
         new_prefix = prefix + extension
         
-        try:
-            # Get sorted directory contents (folders first, then files)
-            items = []
-            for item in os.listdir(path):
-                item_path = path / item
-                # Skip hidden items if not showing them
-                if not show_hidden and item.startswith('.'):
-                    continue
-                # Skip excluded extensions
-                if (not item_path.is_dir() and 
-                    any(item.lower().endswith(ext.lower()) for ext in exclude_extensions)):
-                    continue
-                items.append(item)
-            
-            # Sort with folders first, then case-insensitive alphabetical
-            items.sort(key=lambda x: (not os.path.isdir(os.path.join(path, x)), x.lower()))
-            
-        except PermissionError:
-            self.tree_text.insert(tk.END, f"{new_prefix}└── [Permission denied]\n", 'error')
+        if node.children is None:
+            lines.append((f"{new_prefix}└── [Permission denied]\n", ('error',)))
             return
         
+        children = []
+        for child in node.children:
+            # Skip hidden items if not showing them
+            if not show_hidden and child.name.startswith('.'):
+                continue
+            # Skip excluded extensions
+            if not child.is_dir and excluded_exts:
+                _, dot, ext = child.name.rpartition('.')
+                if dot and ext.lower() in excluded_exts:
+                    continue
+            children.append(child)
+        
         # Process each item in the directory
-        for i, item in enumerate(items):
-            is_last_item = i == len(items) - 1
-            self.print_tree(
-                path / item,
+        for i, child in enumerate(children):
+            is_last_item = i == len(children) - 1
+            self._render_node(
+                child,
+                child.name,
                 new_prefix,
                 is_last_item,
-                False,
                 max_depth,
                 current_depth + 1,
                 exclude_dirs,
-                exclude_extensions,
-                show_hidden
-            )    
+                excluded_exts,
+                show_hidden,
+                lines
+            )
+    
+    def _insert_lines(self, lines):
+        """
+        Insert rendered (text, tags) lines into the text widget in one go.
+        
+        The text is inserted with a single call and each tag is then applied
+        with a single tag_add over all of its line ranges, merging runs of
+        consecutive lines, instead of one Tcl round-trip per line.
+        """
+        if not lines:
+            return
+        
+        first_line = int(self.tree_text.index('end-1c').split('.')[0])
+        self.tree_text.insert(tk.END, ''.join(text for text, _ in lines))
+        
+        ranges = {}
+        lineno = first_line
+        for text, tags in lines:
+            next_lineno = lineno + text.count('\n')
+            for tag in tags:
+                spans = ranges.setdefault(tag, [])
+                if spans and spans[-1][1] == lineno:
+                    spans[-1][1] = next_lineno
+                else:
+                    spans.append([lineno, next_lineno])
+            lineno = next_lineno
+        
+        for tag, spans in ranges.items():
+            indices = []
+            for start, stop in spans:
+                indices += (f'{start}.0', f'{stop}.0')
+            self.tree_text.tag_add(tag, *indices)
+    
+    def _scan(self, path, cancel=None):
+        """
+        Scan a directory tree once, post-order, with os.scandir.
+        
+        Sizes, file counts and directory counts are aggregated bottom-up so
+        that rendering and the summary panel need no further traversal.
+        Makes no Tk calls, so it is safe to run on a worker thread; once the
+        optional `cancel` event is set the scan stops early and returns a
+        partial tree.
+        
+        Returns:
+            The root Node of the scanned tree
+        """
+        st = os.stat(path)
+        if not stat.S_ISDIR(st.st_mode):
+            return Node(os.path.basename(path), path, False, st.st_size, 0, 0, [])
+        
+        name = os.path.basename(os.path.normpath(path))
+        try:
+            children, size = self._read_dir(path, cancel)
+        except OSError:
+            return Node(name, path, True, 0, 0, 0, None)
+        
+        # Nothing to fan out with fewer than two subdirectories
+        subdirs = sum(1 for child in children if not isinstance(child, Node))
+        if subdirs < 2:
+            return self._collect(name, path, children, size, cancel)
+        
+        # Scan each top-level subdirectory in its own worker; the
+        # GIL is released while blocked in readdir/stat calls
+        workers = min(32, (os.cpu_count() or 1) * 4, subdirs)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return self._collect(name, path, children, size, cancel, executor)
+    
+    def _scan_dir(self, name, path, cancel=None):
+        try:
+            children, size = self._read_dir(path, cancel)
+        except OSError:
+            return Node(name, path, True, 0, 0, 0, None)
+        return self._collect(name, path, children, size, cancel)
+    
+    def _read_dir(self, path, cancel=None):
+        """
+        List one directory and size its files while it is open.
+        
+        Returns the sorted children, with a Node for each file and a
+        (name, path) pair for each subdirectory still to be scanned, plus the
+        total size of the files. The directory is closed before returning, so
+        recursing into the subdirectories never holds more than one
+        descriptor per thread.
+        """
+        with _open_dir(path) as (dir_fd, entries):
+            # Resolve each entry's type once, from readdir's d_type (or a single
+            # lstat where the filesystem doesn't report it). These flags drive the
+            # sort, the recursion branch and the resulting Node, so no entry is
+            # stat'ed more than once for its type.
+            typed = []
+            for entry in entries:
+                try:
+                    is_symlink = entry.is_symlink()
+                    # Symlinks to directories are shown and counted as
+                    # directories, like os.walk did, but never followed
+                    is_dir_link = is_symlink and entry.is_dir()
+                    typed.append((entry.is_dir(follow_symlinks=False), is_dir_link, is_symlink, entry))
+                except OSError:
+                    continue  # Entry vanished or can't be stat'ed
+            
+            # Sort with folders first, then case-insensitive alphabetical
+            typed.sort(key=lambda t: (not (t[0] or t[1]), t[3].name.lower()))
+            
+            buf = _Statx()
+            size = 0
+            children = []
+            for is_dir, is_dir_link, is_symlink, entry in typed:
+                if cancel is not None and cancel.is_set():
+                    break
+                # Entries from a descriptor scan only carry their name in .path
+                child_path = entry.path if dir_fd is None else os.path.join(path, entry.name)
+                if is_dir:
+                    children.append((entry.name, child_path))
+                    continue
+                if is_dir_link:
+                    # Empty, zero-sized folder Node: the target isn't scanned
+                    children.append(Node(entry.name, child_path, True, 0, 0, 0, []))
+                    continue
+                try:
+                    file_size = _fast_size(dir_fd, entry, buf)
+                except OSError:
+                    continue
+                children.append(Node(entry.name, child_path, False, file_size, 0, 0, []))
+                # Symlinks are listed but not counted towards folder sizes
+                if not is_symlink:
+                    size += file_size
+        return children, size
+    
+    def _collect(self, name, path, children, size, cancel=None, executor=None):
+        """Scan the subdirectories found by _read_dir() and aggregate the Node."""
+        resolved = []
+        for child in children:
+            if not isinstance(child, Node):
+                if cancel is not None and cancel.is_set():
+                    continue
+                child_name, child_path = child
+                if executor is None:
+                    child = self._scan_dir(child_name, child_path, cancel)
+                else:
+                    child = executor.submit(self._scan_dir, child_name, child_path, cancel)
+            resolved.append(child)
+        
+        # Join subtrees scanned by worker threads, keeping the sorted order
+        if executor is not None:
+            resolved = [c.result() if isinstance(c, Future) else c for c in resolved]
+        
+        nfiles = ndirs = 0
+        for child in resolved:
+            if child.is_dir:
+                size += child.size
+                nfiles += child.nfiles
+                ndirs += child.ndirs + 1
+            else:
+                nfiles += 1
+        
+        return Node(name, path, True, size, nfiles, ndirs, resolved)
+    
     def get_folder_size(self, folder_path):
         total_size = 0
-        for dirpath, _, filenames in os.walk(folder_path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                if not os.path.islink(fp):
-                    try:
-                        total_size += os.path.getsize(fp)
-                    except (OSError, PermissionError):
-                        continue
+        buf = _Statx()
+        stack = [folder_path]
+        while stack:
+            dirpath = stack.pop()
+            try:
+                with _open_dir(dirpath) as (dir_fd, entries):
+                    for entry in entries:
+                        try:
+                            if entry.is_symlink():
+                                continue
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path if dir_fd is None else os.path.join(dirpath, entry.name))
+                            else:
+                                total_size += _fast_size(dir_fd, entry, buf)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
         return total_size
     
-    def format_size(self, size_bytes):
-        units = ['B', 'KB', 'MB', 'GB', 'TB']
-        size = float(size_bytes)
-        unit_index = 0
-        
-        while size >= 1024 and unit_index < len(units) - 1:
-            size /= 1024
-            unit_index += 1
-        
-        return f"{size:.2f} {units[unit_index]}"
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def format_size(size_bytes):
+        # Each unit is 2**10 times the previous one, so the unit index follows
+        # directly from the bit length instead of repeated division
+        size_bytes = int(size_bytes)
+        unit_index = min(max(size_bytes.bit_length() - 1, 0) // 10, len(_UNITS) - 1)
+        return f"{size_bytes / (1 << (unit_index * 10)):.2f} {_UNITS[unit_index]}"
     
-    def update_summary(self, path):
+    def update_summary(self, path, node=None):
         try:
-            total_size = self.get_folder_size(path)
-            num_files = sum([len(files) for _, _, files in os.walk(path)])
-            num_dirs = sum([len(dirs) for _, dirs, _ in os.walk(path)]) - 1
+            if node is None:
+                node = self._scan(path)
+            total_size = node.size
+            num_files = node.nfiles
+            num_dirs = node.ndirs
             
             self.summary_labels['path'].config(text=f"Path: {os.path.abspath(path)}")
             self.summary_labels['created'].config(text=f"Created: {datetime.fromtimestamp(Path(path).stat().st_ctime)}")
@@ -2,24 +2,28 @@ import re
 import os
 from pathlib import Path
 
+# Compiled once at import instead of on every call / line
+_STRUCT_RE = re.compile(r"Project Structure\ntext\n([\s\S]+?)File Contents")
+_FILE_RE = re.compile(r"(\d+\. .+?)\n([\s\S]+?)(?=\d+\. |$)")
+_PREFIX_RE = re.compile(r'^[├│└─ ]+')
+
 def parse_project_structure(content):
     # Extract project structure
-    structure_pattern = r"Project Structure\ntext\n([\s\S]+?)File Contents"
-    structure_match = re.search(structure_pattern, content)
+    structure_match = _STRUCT_RE.search(content)
     if not structure_match:
         raise ValueError("Could not find project structure in the content")
     
     structure_text = structure_match.group(1)
     
     # Extract file contents
-    file_pattern = r"(\d+\. .+?)\n([\s\S]+?)(?=\d+\. |$)"
-    file_matches = re.finditer(file_pattern, content[len(structure_text):])
+    file_matches = _FILE_RE.finditer(content[len(structure_text):])
     
     # Parse structure into directory tree
     dir_tree = {}
     for line in structure_text.split('\n'):
         if line.strip():
-            depth = len(re.match(r'^[├│└─ ]+', line).group()) if re.match(r'^[├│└─ ]+', line) else 0
+            prefix_match = _PREFIX_RE.match(line)
+            depth = len(prefix_match.group()) if prefix_match else 0
             name = line.strip().replace('├── ', '').replace('│   ', '').replace('└── ', '')
             if depth == 0:
                 current_path = [name]
@@ -67,29 +71,30 @@ def parse_project_structure(content):
     return dir_tree, files
 
 def create_project_structure(dir_tree, files):
-    # Create directories and files
+    # Build one final {path: content} mapping of everything to write
+    outputs = {}
     for path, children in dir_tree.items():
-        # Create directory
-        dir_path = Path(path)
-        os.makedirs(dir_path, exist_ok=True)
-        
-        # Create files in this directory
-        for filename, _ in children.items():
-            file_path = dir_path / filename
-            file_content = files.get(str(file_path), "")
-            
-            # Handle special cases for empty __init__.py files
-            if filename == '__init__.py' and not file_content:
-                file_content = ''
-            
-            with open(file_path, 'w') as f:
-                f.write(file_content)
+        for filename in children:
+            file_path = str(Path(path) / filename)
+            # Empty __init__.py files (and any file without content) are written empty
+            outputs[file_path] = files.get(file_path, "")
     
-    # Create files not in the directory tree (like requirements.txt)
+    # Add files not in the directory tree (like requirements.txt), without
+    # overwriting anything that already exists on disk
     for file_path, content in files.items():
-        if not Path(file_path).exists():
-            with open(file_path, 'w') as f:
-                f.write(content)
+        if file_path not in outputs and not Path(file_path).exists():
+            outputs[file_path] = content
+    
+    # Create each unique directory once, parents first
+    directories = set(dir_tree)
+    directories.update(os.path.dirname(file_path) for file_path in outputs)
+    directories.discard('')
+    for dir_path in sorted(directories, key=len):
+        os.makedirs(dir_path, exist_ok=True)
+    
+    for file_path, content in outputs.items():
+        with open(file_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            f.write(content)
 
 def main():
     # Read the input file
@@ -11,22 +11,24 @@ A lightweight Python utility to identify largest files on your storage drives.
 
 ✨ Features:
 - Scans entire directory trees recursively
-- Identifies top 25 largest files by default
-- Efficient memory usage with min-heap algorithm
+- Identifies top 15 largest files by default
+- Efficient memory usage with a streaming min-heap (heapq.nlargest)
 - Handles permission errors gracefully
 - Displays results in clean MB format
-- Outputs top 15 files by default in ranked order
+- Outputs the files in ranked order
 
 🔧 Requirements:
 ✔ Windows/macOS/Linux
 ✔ Python 3.6 or newer
 ✔ Standard OS permissions (admin not required)
+✔ Optional on Linux: liburing package (pip install liburing) for batched io_uring stat calls,
+  off by default - set MAX_STORAGE_FILES_IO_URING=1 to enable
 
 🛠 How It Works:
 1. Walks through all files in specified directory
-2. Tracks file sizes using efficient heap structure
+2. Streams file sizes into a heap of the top files
 3. Maintains only top files in memory
-4. Sorts final results by size (descending)
+4. Returns final results by size (descending)
 5. Presents clean formatted output
 
 📝 Notes:
@@ -51,40 +53,126 @@ Last Updated: 2023-11-20
 """
 
 import os
+import sys
 import heapq
+from operator import itemgetter
 
-MAX_TOP_FILES = 25
-
-# Min-heap to store top files by size
-top_files = []
-
-def update_top_files(path, size):
-    if len(top_files) < MAX_TOP_FILES:
-        heapq.heappush(top_files, (size, path))
-    else:
-        if size > top_files[0][0]:  # Replace the smallest
-            heapq.heappushpop(top_files, (size, path))
-
-def search_directory(directory):
+# Optional, opt-in: batch stat calls through io_uring on Linux. Off by
+# default since the plain scandir walk measured just as fast.
+liburing = None
+if sys.platform.startswith('linux') and os.environ.get('MAX_STORAGE_FILES_IO_URING') == '1':
     try:
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                full_path = os.path.join(root, file)
-                try:
-                    size = os.path.getsize(full_path)
-                    update_top_files(full_path, size)
-                except Exception:
-                    pass  # Skip unreadable files
-    except Exception:
-        pass  # Skip directories with permission issues
+        import liburing
+    except ImportError:
+        pass
+
+MAX_TOP_FILES = 15
+
+# Number of statx requests submitted to io_uring at once
+RING_DEPTH = 256
+
+def _walk_files(directory):
+    """Yield a DirEntry for every regular file below directory (symlinks are not followed)"""
+    stack = [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry
+                    except OSError:
+                        pass  # Skip unreadable entries
+        except OSError:
+            pass  # Skip directories with permission issues, keep scanning the rest
+
+def _statx_batch(ring, cqe, paths):
+    """Submit one statx per path to the ring, then yield (size, path) as they complete"""
+    flags = liburing.AT_SYMLINK_NOFOLLOW | liburing.AT_STATX_DONT_SYNC
+    buffers = [liburing.Statx() for _ in paths]
+    for i, path in enumerate(paths):
+        sqe = liburing.io_uring_get_sqe(ring)
+        liburing.io_uring_prep_statx(sqe, buffers[i], path, flags, liburing.STATX_SIZE)
+        liburing.io_uring_sqe_set_data64(sqe, i)
+    liburing.io_uring_submit_and_wait(ring, len(paths))
+    
+    for _ in paths:
+        liburing.io_uring_wait_cqe(ring, cqe)
+        done = cqe[0]
+        try:
+            if done.res is not None:  # Raises OSError if this statx failed
+                i = done.user_data
+                yield buffers[i].size, paths[i]
+        except OSError:
+            pass  # Skip unreadable files
+        finally:
+            liburing.io_uring_cqe_seen(ring, done)
+
+def _io_uring_files(directory, ring):
+    """
+    Yield (size, path) like iter_files(), but with statx requests batched
+    RING_DEPTH at a time through io_uring, so the syscall cost is paid per
+    batch instead of per file.
+    """
+    cqe = liburing.Cqe()
+    pending = []
+    for entry in _walk_files(directory):
+        try:
+            # The binding only takes str paths and encodes them as strict
+            # UTF-8, so check that up front instead of failing mid-batch
+            entry.path.encode('utf-8')
+        except UnicodeEncodeError:
+            # Not valid UTF-8 (undecodable bytes in the name): size it directly
+            try:
+                yield entry.stat(follow_symlinks=False).st_size, entry.path
+            except OSError:
+                pass  # Skip unreadable files
+            continue
+        pending.append(entry.path)
+        if len(pending) == RING_DEPTH:
+            yield from _statx_batch(ring, cqe, pending)
+            pending = []
+    if pending:
+        yield from _statx_batch(ring, cqe, pending)
+
+def _open_ring():
+    """Return an initialised io_uring instance, or None if io_uring can't be used here"""
+    if liburing is None:
+        return None
+    ring = liburing.Ring()
+    try:
+        liburing.io_uring_queue_init(RING_DEPTH, ring)
+    except OSError:
+        return None  # e.g. old kernel or io_uring disabled by seccomp
+    return ring
+
+def iter_files(directory):
+    """Yield (size in bytes, path) for every regular file below directory"""
+    ring = _open_ring()
+    if ring is not None:
+        try:
+            yield from _io_uring_files(directory, ring)
+        finally:
+            liburing.io_uring_queue_exit(ring)
+        return
+    
+    for entry in _walk_files(directory):
+        try:
+            yield entry.stat(follow_symlinks=False).st_size, entry.path
+        except OSError:
+            pass  # Skip unreadable files
+
+def search_directory(directory, count=MAX_TOP_FILES):
+    """Return the count largest files below directory as (size, path), largest first"""
+    # nlargest keeps a single min-heap of `count` entries while streaming
+    return heapq.nlargest(count, iter_files(directory), key=itemgetter(0))
 
 if __name__ == "__main__":
-    search_directory("C:\\")
-
-    # Sort files in descending order by size
-    top_files_sorted = sorted(top_files, reverse=True)
+    top_files = search_directory("C:\\")
 
-    print("Top 15 Largest Files in C:\\ Drive:")
+    print(f"Top {MAX_TOP_FILES} Largest Files in C:\\ Drive:")
     print("===================================")
-    for i, (size, path) in enumerate(top_files_sorted, 1):
-        print(f"{i:2d}. {size // (1024 * 1024)} MB\n    {path}\n")
+    for i, (size, path) in enumerate(top_files, 1):
+        print(f"{i:2d}. {size // (1024 * 1024)} MB\n    {path}\n")
\ No newline at end of file
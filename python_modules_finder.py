@@ -66,6 +66,43 @@ import psutil
 from tabulate import tabulate
 from importlib.metadata import distributions, requires
 from collections import defaultdict
+from operator import itemgetter
+
+def _loaded_module_sizes():
+    """Yield (module name, file size in bytes) for every loaded module with a file"""
+    if os.name != 'nt':
+        # stat() each module file; listing its directory would add work here
+        for name, module in list(sys.modules.items()):
+            try:
+                if hasattr(module, '__file__') and module.__file__:
+                    yield name, os.path.getsize(module.__file__)
+            except (TypeError, OSError, AttributeError):
+                continue
+        return
+    
+    # On Windows scandir returns file sizes with the listing, so group the
+    # modules by directory and list each directory only once
+    modules_by_dir = defaultdict(list)
+    for name, module in list(sys.modules.items()):
+        try:
+            if hasattr(module, '__file__') and module.__file__:
+                modules_by_dir[os.path.dirname(module.__file__)].append((name, module.__file__))
+        except (TypeError, AttributeError):
+            continue
+    
+    for dirpath, modules in modules_by_dir.items():
+        try:
+            with os.scandir(dirpath or os.curdir) as it:
+                entries = {entry.name: entry for entry in it}
+        except OSError:
+            entries = {}  # Fall back to getsize() for this directory
+        
+        for name, module_file in modules:
+            try:
+                entry = entries.get(os.path.basename(module_file))
+                yield name, entry.stat().st_size if entry else os.path.getsize(module_file)
+            except OSError:
+                continue
 
 def get_python_modules_info():
     # Get process memory
@@ -77,14 +114,10 @@ def get_python_modules_info():
     module_sizes = defaultdict(float)
     
     # Calculate loaded modules memory
-    for name, module in list(sys.modules.items()):
-        try:
-            if hasattr(module, '__file__') and module.__file__:
-                size = os.path.getsize(module.__file__) / (1024 * 1024)
-                module_sizes[name.split('.')[0]] += size
-                total_memory += size
-        except (TypeError, OSError, AttributeError):
-            continue
+    for name, size in _loaded_module_sizes():
+        size /= 1024 * 1024
+        module_sizes[name.split('.')[0]] += size
+        total_memory += size
     
     # Get package info
     for dist in distributions():
@@ -94,17 +127,18 @@ def get_python_modules_info():
             deps = requires(pkg_name) or []
             primary_dep = deps[0].split(' ')[0] if deps else 'None'
             
-            modules_info.append([
+            # Keep the size numeric; it is only formatted for display
+            modules_info.append((
                 pkg_name,
                 version,
-                f"{module_sizes.get(pkg_name.lower(), 0):.2f} MB",
+                module_sizes.get(pkg_name.lower(), 0.0),
                 primary_dep[:20]
-            ])
+            ))
         except Exception as e:
             continue
     
     # Sort by memory descending
-    modules_info.sort(key=lambda x: float(x[2].split()[0]), reverse=True)
+    modules_info.sort(key=itemgetter(2), reverse=True)
     
     # Display
     if not modules_info:
@@ -112,8 +146,12 @@ def get_python_modules_info():
         return
     
     print("\n\033[1;36mPYTHON MODULES INFORMATION\033[0m")
+    rows = [
+        (pkg_name, version, f"{size_mb:.2f} MB", primary_dep)
+        for pkg_name, version, size_mb, primary_dep in modules_info[:20]
+    ]
     print(tabulate(
-        modules_info[:20],
+        rows,
         headers=["\033[1mModule\033[0m", "\033[1mVersion\033[0m", "\033[1mMemory\033[0m", "\033[1mDependency\033[0m"],
         tablefmt="fancy_grid",
         numalign="right"
@@ -51,12 +51,20 @@ Version: 1.1
 Last Updated: 2023-11-15
 """
 
+import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from colorama import Fore
 
+# Parallel 'netsh wlan show profile' lookups in print_results()
+MAX_WORKERS = 8
+
+# Matches both fields of interest in 'netsh wlan show profile ... key=clear'
+_FIELDS_RE = re.compile(r'^[ \t]*(Key Content|Authentication)[ \t]*:[ \t]*([^\n]*?)[ \t]*\r?$', re.M)
+
 def get_wifi_profiles():
     """
     Retrieve all saved Wi-Fi profiles from Windows system using netsh command
@@ -88,18 +96,13 @@ def get_wifi_details(profile):
             universal_newlines=True
         )
         
-        password_lines = [line.split(":")[1].strip() 
-                         for line in results.split('\n') 
-                         if "Key Content" in line]
-        password = password_lines[0] if password_lines else "Not Available"
-        
-        # Get security type
-        security_lines = [line.split(":")[1].strip() 
-                         for line in results.split('\n') 
-                         if "Authentication" in line]
-        security = security_lines[0] if security_lines else "Unknown"
+        # Parse password and security type in one pass, keeping the
+        # first value when netsh lists a field more than once
+        fields = {}
+        for key, value in _FIELDS_RE.findall(results):
+            fields.setdefault(key, value)
         
-        return password, security
+        return fields.get("Key Content", "Not Available"), fields.get("Authentication", "Unknown")
         
     except subprocess.CalledProcessError as e:
         print(f"[!] Error retrieving details for {profile}: {e.stderr}")
@@ -113,6 +116,11 @@ def print_results(profiles):
     
     init()  # Initialize colorama
     
+    # Each netsh call is an independent subprocess, so run them concurrently
+    # instead of paying their start-up latency one after another
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        details = list(executor.map(get_wifi_details, profiles))
+    
     # Header with timestamp
     print(f"\n{Fore.CYAN}{' SAVED WI-FI PASSWORDS ':=^60}{Fore.RESET}")
     print(f"{Fore.YELLOW}Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{Fore.RESET}\n")
@@ -122,9 +130,7 @@ def print_results(profiles):
     print(f"{'-'*5} | {'-'*25} | {'-'*20} | {'-'*15}")
     
     # Print each profile
-    for idx, profile in enumerate(profiles, 1):
-        password, security = get_wifi_details(profile)
-        
+    for idx, (profile, (password, security)) in enumerate(zip(profiles, details), 1):
         # Color coding for password availability
         password_color = Fore.RED if password == "Not Available" else Fore.GREEN
         